@@ -32,6 +32,8 @@ class EntityModel(BaseModel):
 class EntityConfig(ABC):
     """An abstract entity XML config builder class."""
 
+    __slots__ = ()
+
     @abstractmethod
     def to_xml(self) -> str:
         """Return entity XML config."""
@@ -40,3 +42,5 @@ class EntityConfig(ABC):
 
 class DeviceConfig(EntityConfig):
     """An abstract device XML config."""
+
+    __slots__ = ()
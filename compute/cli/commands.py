@@ -39,6 +39,8 @@ from compute.utils import dictutil, diskutils, ids
 
 log = logging.getLogger(__name__)
 
+_CIDATA_FILE_PATH_RE = re.compile(r'[^\n]{1,1024}')
+
 libvirt.registerErrorHandler(
     lambda userdata, err: None,  # noqa: ARG005
     ctx=None,
@@ -147,7 +149,7 @@ def init(session: Session, args: argparse.Namespace) -> None:
                     data['cloud_init'][item] = base64.b64decode(
                         cidata.split(':')[1]
                     ).decode('utf-8')
-                elif re.fullmatch(r'^[^\n]{1,1024}$', cidata, re.I):
+                elif _CIDATA_FILE_PATH_RE.fullmatch(cidata):
                     data_file = pathlib.Path(cidata)
                     if data_file.exists():
                         with data_file.open('r') as f:
@@ -218,12 +220,11 @@ def ls(session: Session, args: argparse.Namespace) -> None:  # noqa: ARG001
     """List compute instances."""
     table = Table()
     table.header = ['NAME', 'STATE', 'NVCPUS', 'MEMORY']
-    for instance in session.list_instances():
-        info = instance.get_info()
+    for name, info in session.list_instances_info().items():
         table.add_row(
             [
-                instance.name,
-                instance.get_status() + ' ',
+                name,
+                info.state + ' ',
                 info.nproc,
                 f'{int(info.memory / 1024)} MiB',
             ]
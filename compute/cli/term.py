@@ -15,7 +15,6 @@
 
 """Utils for creating terminal output and interface elements."""
 
-import re
 import sys
 
 
@@ -70,8 +69,9 @@ def confirm(message: str, *, default: bool | None = None) -> None:
             sys.exit('aborted')
         if not answer and isinstance(default, bool):
             return default
-        if re.match(r'^y(es)?$', answer, re.I):
+        answer = answer.lower()
+        if answer in ('y', 'yes'):
             return True
-        if re.match(r'^no?$', answer, re.I):
+        if answer in ('n', 'no'):
             return False
         print("Please respond 'yes' or 'no'")
@@ -19,7 +19,8 @@ __all__ = ['Config', 'ConfigSchema']
 
 import os
 import tomllib
-from collections import UserDict
+from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
 from typing import ClassVar
 
@@ -28,6 +29,16 @@ from .exceptions import ConfigLoaderError
 from .utils import dictutil
 
 
+@lru_cache(maxsize=8)
+def _load_toml(path: Path, mtime_ns: int) -> dict:  # noqa: ARG001
+    # path must be resolved by caller, so that the same relative path
+    # from another working directory does not hit the cache. mtime_ns
+    # is a part of the cache key only, so that changed file is read
+    # again.
+    with path.open('rb') as configfile:
+        return tomllib.load(configfile)
+
+
 class LibvirtConfigSchema(EntityModel):
     """Schema for libvirt config."""
 
@@ -56,9 +67,9 @@ class ConfigSchema(EntityModel):
     storage: StorageConfigSchema
 
 
-class Config(UserDict):
+class Config(dict):
     """
-    UserDict for storing configuration.
+    Dictionary for storing configuration.
 
     Environment variables prefix is ``CMP_``. Environment variables
     have higher proirity then configuration file.
@@ -97,11 +108,10 @@ class Config(UserDict):
         """
         self.file = Path(file) if file else self.DEFAULT_CONFIG_FILE
         try:
-            if self.file.exists():
-                with self.file.open('rb') as configfile:
-                    loaded = tomllib.load(configfile)
-            else:
-                loaded = {}
+            path = self.file.resolve()
+            loaded = deepcopy(_load_toml(path, path.stat().st_mtime_ns))
+        except (FileNotFoundError, NotADirectoryError):
+            loaded = {}
         except tomllib.TOMLDecodeError as etoml:
             raise ConfigLoaderError(
                 f'Bad TOML syntax: {self.file}: {etoml}'
@@ -110,7 +120,9 @@ class Config(UserDict):
             raise ConfigLoaderError(
                 f'Config read error: {self.file}: {eread}'
             ) from eread
-        config = dictutil.override(self.DEFAULT_CONFIGURATION, loaded)
+        config = dictutil.override(
+            deepcopy(self.DEFAULT_CONFIGURATION), loaded
+        )
         if self.LIBVIRT_URI:
             config['libvirt']['uri'] = self.LIBVIRT_URI
         if self.VOLUMES_POOL:
@@ -15,5 +15,5 @@
 
 from .cloud_init import CloudInit
 from .guest_agent import GuestAgent
-from .instance import Instance, InstanceConfig
+from .instance import Instance, InstanceConfig, InstanceInfo
 from .schemas import InstanceSchema
@@ -28,7 +28,11 @@ from compute.abstract import DeviceConfig
 from compute.exceptions import InvalidDeviceConfigError
 
 
-@dataclass
+def _dump_xml(xml: etree.Element) -> str:
+    return etree.tostring(xml, encoding='unicode', pretty_print=True).strip()
+
+
+@dataclass(slots=True)
 class DiskDriver:
     """Disk driver description for libvirt."""
 
@@ -41,7 +45,7 @@ class DiskDriver:
         return self
 
 
-@dataclass
+@dataclass(slots=True)
 class DiskConfig(DeviceConfig):
     """
     Disk config builder.
@@ -58,22 +62,27 @@ class DiskConfig(DeviceConfig):
     bus: str = 'virtio'
     driver: DiskDriver = field(default_factory=DiskDriver())
 
+    def __post_init__(self):
+        """Convert `source` path to string."""
+        if isinstance(self.source, Path):
+            self.source = str(self.source)
+
     def to_xml(self) -> str:
         """Return XML config for libvirt."""
-        xml = E.disk(type=self.type, device=self.device)
-        xml.append(
+        children = [
             E.driver(
                 name=self.driver.name,
                 type=self.driver.type,
                 cache=self.driver.cache,
             )
-        )
+        ]
         if self.source and self.type == 'file':
-            xml.append(E.source(file=str(self.source)))
-        xml.append(E.target(dev=self.target, bus=self.bus))
+            children.append(E.source(file=self.source))
+        children.append(E.target(dev=self.target, bus=self.bus))
         if self.is_readonly:
-            xml.append(E.readonly())
-        return etree.tostring(xml, encoding='unicode', pretty_print=True)
+            children.append(E.readonly())
+        xml = E.disk(*children, type=self.type, device=self.device)
+        return etree.tostring(xml, encoding='unicode')
 
     @classmethod
     def from_xml(cls, xml: Union[str, etree.Element]) -> 'DiskConfig':
@@ -87,11 +96,7 @@ class DiskConfig(DeviceConfig):
             xml_str = xml
             xml = etree.fromstring(xml)
         else:
-            xml_str = etree.tostring(
-                xml,
-                encoding='unicode',
-                pretty_print=True,
-            ).strip()
+            xml_str = None
         source = xml.find('source')
         target = xml.find('target')
         driver = xml.find('driver')
@@ -109,17 +114,18 @@ class DiskConfig(DeviceConfig):
             'bus': target.get('bus') if target is not None else None,
             'is_readonly': False if xml.find('readonly') is None else True,
         }
-        for param in disk_params:
-            if disk_params[param] is None:
+        for param, value in disk_params.items():
+            if value is None:
                 msg = f"missing tag '{param}'"
-                raise InvalidDeviceConfigError(msg, xml_str)
+                raise InvalidDeviceConfigError(msg, xml_str or _dump_xml(xml))
             if param == 'driver':
-                driver = disk_params[param]
-                for driver_param in [driver.name, driver.type, driver.cache]:
+                for driver_param in [value.name, value.type, value.cache]:
                     if driver_param is None:
                         msg = (
                             "'driver' tag must have "
                             "'name' and 'type' attributes"
                         )
-                        raise InvalidDeviceConfigError(msg, xml_str)
+                        raise InvalidDeviceConfigError(
+                            msg, xml_str or _dump_xml(xml)
+                        )
         return cls(**disk_params)
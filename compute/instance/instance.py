@@ -19,12 +19,13 @@ __all__ = ['Instance', 'InstanceConfig', 'InstanceInfo']
 
 import logging
 import time
-from typing import NamedTuple
+from dataclasses import dataclass
+from io import BytesIO
 from uuid import UUID
+from xml.sax.saxutils import escape
 
 import libvirt
 from lxml import etree
-from lxml.builder import E
 
 from compute.abstract import DeviceConfig, EntityConfig
 from compute.exceptions import (
@@ -35,16 +36,84 @@ from compute.utils import units
 
 from .devices import DiskConfig
 from .guest_agent import GuestAgent
-from .schemas import (
-    CPUEmulationMode,
-    CPUSchema,
-    InstanceSchema,
-    NetworkInterfaceSchema,
-)
+from .schemas import CPUEmulationMode, CPUSchema, InstanceSchema
 
 
 log = logging.getLogger(__name__)
 
+_INSTANCE_STATES = {
+    libvirt.VIR_DOMAIN_NOSTATE: 'nostate',
+    libvirt.VIR_DOMAIN_RUNNING: 'running',
+    libvirt.VIR_DOMAIN_BLOCKED: 'blocked',
+    libvirt.VIR_DOMAIN_PAUSED: 'paused',
+    libvirt.VIR_DOMAIN_SHUTDOWN: 'shutdown',
+    libvirt.VIR_DOMAIN_SHUTOFF: 'shutoff',
+    libvirt.VIR_DOMAIN_CRASHED: 'crashed',
+    libvirt.VIR_DOMAIN_PMSUSPENDED: 'pmsuspended',
+}
+_SHUTDOWN_METHODS = {
+    'SOFT': libvirt.VIR_DOMAIN_SHUTDOWN_GUEST_AGENT,
+    'NORMAL': libvirt.VIR_DOMAIN_SHUTDOWN_DEFAULT,
+    'HARD': libvirt.VIR_DOMAIN_DESTROY_GRACEFUL,
+    'DESTROY': libvirt.VIR_DOMAIN_DESTROY_DEFAULT,
+}
+_GUEST_SHUTDOWN_METHODS = frozenset(('SOFT', 'NORMAL'))
+
+_DOMAIN_XML_TEMPLATE = """\
+<domain type="kvm">
+  <name>{name}</name>
+{title}{description}  <metadata/>
+  <memory unit="KiB">{max_memory}</memory>
+  <currentMemory unit="KiB">{memory}</currentMemory>
+  <vcpu placement="static" current="{vcpus}">{max_vcpus}</vcpu>
+{cpu}  <clock offset="utc">
+    <timer name="rtc" tickpolicy="catchup"/>
+    <timer name="pit" tickpolicy="delay"/>
+    <timer name="hpet" present="no"/>
+  </clock>
+  <os>
+    <type machine="{machine}" arch="{arch}">hvm</type>
+{boot}  </os>
+  <features>
+    <acpi/>
+    <apic/>
+  </features>
+  <on_poweroff>destroy</on_poweroff>
+  <on_reboot>restart</on_reboot>
+  <on_crash>restart</on_crash>
+  <pm>
+    <suspend-to-mem enabled="no"/>
+    <suspend-to-disk enabled="no"/>
+  </pm>
+  <devices>
+    <emulator>{emulator}</emulator>
+{interfaces}"""
+_DOMAIN_XML_STATIC_TAIL = """\
+    <graphics type="vnc" autoport="yes"/>
+    <input type="tablet" bus="usb"/>
+    <channel type="unix">
+      <source mode="bind"/>
+      <target type="virtio" name="org.qemu.guest_agent.0"/>
+      <address type="virtio-serial" controller="0" bus="0" port="1"/>
+    </channel>
+    <serial type="pty">
+      <target port="0"/>
+    </serial>
+    <console type="pty">
+      <target type="serial" port="0"/>
+    </console>
+    <video>
+      <model type="vga" vram="16384" heads="1" primary="yes"/>
+    </video>
+  </devices>
+</domain>
+"""
+
+
+def _quote(value: str) -> str:
+    """Escape value for use in XML text and double-quoted attributes."""
+    return escape(str(value), {'"': '&quot;'})
+
 
 class InstanceConfig(EntityConfig):
     """Compute instance XML config builder."""
@@ -69,7 +138,7 @@ class InstanceConfig(EntityConfig):
         self.boot = schema.boot
         self.network = schema.network
 
-    def _gen_cpu_xml(self, cpu: CPUSchema) -> etree.Element:
+    def _gen_cpu_xml(self, cpu: CPUSchema) -> str:
         options = {
             'mode': cpu.emulation_mode,
             'match': 'exact',
@@ -78,124 +147,78 @@ class InstanceConfig(EntityConfig):
         if cpu.emulation_mode == CPUEmulationMode.HOST_PASSTHROUGH:
             options['check'] = 'none'
             options['migratable'] = 'on'
-        xml = E.cpu(**options)
+        attrs = ' '.join(f'{k}="{v}"' for k, v in options.items())
+        xml = []
         if cpu.model:
-            xml.append(E.model(cpu.model, fallback='forbid'))
+            xml.append(
+                f'    <model fallback="forbid">{_quote(cpu.model)}</model>\n'
+            )
         if cpu.vendor:
-            xml.append(E.vendor(cpu.vendor))
+            xml.append(f'    <vendor>{_quote(cpu.vendor)}</vendor>\n')
         if cpu.topology:
             xml.append(
-                E.topology(
-                    sockets=str(cpu.topology.sockets),
-                    dies=str(cpu.topology.dies),
-                    cores=str(cpu.topology.cores),
-                    threads=str(cpu.topology.threads),
-                )
+                f'    <topology sockets="{cpu.topology.sockets}" '
+                f'dies="{cpu.topology.dies}" '
+                f'cores="{cpu.topology.cores}" '
+                f'threads="{cpu.topology.threads}"/>\n'
             )
         if cpu.features:
-            for feature in cpu.features.require:
-                xml.append(E.feature(policy='require', name=feature))
-            for feature in cpu.features.disable:
-                xml.append(E.feature(policy='disable', name=feature))
-        return xml
-
-    def _gen_vcpus_xml(self, vcpus: int, max_vcpus: int) -> etree.Element:
-        xml = E.vcpus()
-        xml.append(E.vcpu(id='0', enabled='yes', hotpluggable='no', order='1'))
-        for i in range(max_vcpus - 1):
-            enabled = 'yes' if (i + 2) <= vcpus else 'no'
-            xml.append(
-                E.vcpu(
-                    id=str(i + 1),
-                    enabled=enabled,
-                    hotpluggable='yes',
-                    order=str(i + 2),
+            for policy, features in (
+                ('require', cpu.features.require),
+                ('disable', cpu.features.disable),
+            ):
+                xml.extend(
+                    f'    <feature policy="{policy}" '
+                    f'name="{_quote(feature)}"/>\n'
+                    for feature in features
                 )
-            )
-        return xml
-
-    def _gen_network_interface_xml(
-        self, interface: NetworkInterfaceSchema
-    ) -> etree.Element:
-        return E.interface(
-            E.source(network=interface.source),
-            E.mac(address=interface.mac),
-            E.model(type=interface.model),
-            type='network',
-        )
+        if not xml:
+            return f'  <cpu {attrs}/>\n'
+        return f'  <cpu {attrs}>\n' + ''.join(xml) + '  </cpu>\n'
 
     def to_xml(self) -> str:
         """Return XML config for libvirt."""
-        xml = E.domain(type='kvm')
-        xml.append(E.name(self.name))
+        title = description = interfaces = ''
         if self.title:
-            xml.append(E.title(self.title))
+            title = f'  <title>{_quote(self.title)}</title>\n'
         if self.description:
-            xml.append(E.description(self.description))
-        xml.append(E.metadata())
-        xml.append(E.memory(str(self.max_memory * 1024), unit='KiB'))
-        xml.append(E.currentMemory(str(self.memory * 1024), unit='KiB'))
-        xml.append(
-            E.vcpu(
-                str(self.max_vcpus),
-                placement='static',
-                current=str(self.vcpus),
+            description = (
+                f'  <description>{_quote(self.description)}</description>\n'
             )
-        )
-        xml.append(self._gen_cpu_xml(self.cpu))
-        xml.append(
-            E.clock(
-                E.timer(name='rtc', tickpolicy='catchup'),
-                E.timer(name='pit', tickpolicy='delay'),
-                E.timer(name='hpet', present='no'),
-                offset='utc',
-            )
-        )
-        os = E.os(E.type('hvm', machine=self.machine, arch=self.arch))
-        for dev in self.boot.order:
-            os.append(E.boot(dev=dev))
-        xml.append(os)
-        xml.append(E.features(E.acpi(), E.apic()))
-        xml.append(E.on_poweroff('destroy'))
-        xml.append(E.on_reboot('restart'))
-        xml.append(E.on_crash('restart'))
-        xml.append(
-            E.pm(
-                E('suspend-to-mem', enabled='no'),
-                E('suspend-to-disk', enabled='no'),
-            )
-        )
-        devices = E.devices()
-        devices.append(E.emulator(str(self.emulator)))
         if self.network:
-            for interface in self.network.interfaces:
-                devices.append(self._gen_network_interface_xml(interface))
-        devices.append(E.graphics(type='vnc', autoport='yes'))
-        devices.append(E.input(type='tablet', bus='usb'))
-        devices.append(
-            E.channel(
-                E.source(mode='bind'),
-                E.target(type='virtio', name='org.qemu.guest_agent.0'),
-                E.address(
-                    type='virtio-serial', controller='0', bus='0', port='1'
-                ),
-                type='unix',
-            )
-        )
-        devices.append(E.serial(E.target(port='0'), type='pty'))
-        devices.append(
-            E.console(E.target(type='serial', port='0'), type='pty')
-        )
-        devices.append(
-            E.video(
-                E.model(type='vga', vram='16384', heads='1', primary='yes')
+            interfaces = ''.join(
+                '    <interface type="network">\n'
+                f'      <source network="{_quote(interface.source)}"/>\n'
+                f'      <mac address="{_quote(interface.mac)}"/>\n'
+                f'      <model type="{_quote(interface.model)}"/>\n'
+                '    </interface>\n'
+                for interface in self.network.interfaces
             )
+        head = _DOMAIN_XML_TEMPLATE.format_map(
+            {
+                'name': _quote(self.name),
+                'title': title,
+                'description': description,
+                'max_memory': self.max_memory * 1024,
+                'memory': self.memory * 1024,
+                'vcpus': self.vcpus,
+                'max_vcpus': self.max_vcpus,
+                'cpu': self._gen_cpu_xml(self.cpu),
+                'machine': _quote(self.machine),
+                'arch': _quote(self.arch),
+                'boot': ''.join(
+                    f'    <boot dev="{_quote(dev)}"/>\n'
+                    for dev in self.boot.order
+                ),
+                'emulator': _quote(self.emulator),
+                'interfaces': interfaces,
+            }
         )
-        xml.append(devices)
-        return etree.tostring(xml, encoding='unicode', pretty_print=True)
+        return head + _DOMAIN_XML_STATIC_TAIL
 
 
-class InstanceInfo(NamedTuple):
+@dataclass(slots=True, frozen=True)
+class InstanceInfo:
     """
     Store compute instance info.
 
@@ -209,10 +232,31 @@ class InstanceInfo(NamedTuple):
     nproc: int
     cputime: int
 
+    @classmethod
+    def from_stats(cls, stats: dict) -> 'InstanceInfo':
+        """
+        Create :class:`InstanceInfo` from domain stats record.
+
+        Memory values are in KiB and CPU time is in nanoseconds, same
+        as in virDomainInfo. CPU time is 0 for inactive instance.
+
+        :param stats: Stats dict returned by getAllDomainStats() with
+            state, balloon, vcpu and cpu-total groups.
+        """
+        return cls(
+            state=_INSTANCE_STATES[stats['state.state']],
+            max_memory=stats.get('balloon.maximum', 0),
+            memory=stats.get('balloon.current', 0),
+            nproc=stats.get('vcpu.current', 0),
+            cputime=stats.get('cpu.time', 0),
+        )
+
 
 class Instance:
     """Manage compute instances."""
 
+    __slots__ = ('_connection', '_domain', '_guest_agent', '_name', '_uuid')
+
     def __init__(self, domain: libvirt.virDomain):
         """
         Initialise Compute Instance object.
@@ -220,14 +264,16 @@ class Instance:
         :param domain: libvirt domain object
         """
         self._domain = domain
-        self._connection = domain.connect()
+        self._connection = None
         self._name = domain.name()
         self._uuid = domain.UUID()
-        self._guest_agent = GuestAgent(domain)
+        self._guest_agent = None
 
     @property
     def connection(self) -> libvirt.virConnect:
         """Libvirt connection object."""
+        if self._connection is None:
+            self._connection = self._domain.connect()
         return self._connection
 
     @property
@@ -248,20 +294,20 @@ class Instance:
     @property
     def guest_agent(self) -> GuestAgent:
         """:class:`GuestAgent` object."""
+        if self._guest_agent is None:
+            self._guest_agent = GuestAgent(self._domain)
         return self._guest_agent
 
     def _expand_instance_state(self, state: int) -> str:
-        states = {
-            libvirt.VIR_DOMAIN_NOSTATE: 'nostate',
-            libvirt.VIR_DOMAIN_RUNNING: 'running',
-            libvirt.VIR_DOMAIN_BLOCKED: 'blocked',
-            libvirt.VIR_DOMAIN_PAUSED: 'paused',
-            libvirt.VIR_DOMAIN_SHUTDOWN: 'shutdown',
-            libvirt.VIR_DOMAIN_SHUTOFF: 'shutoff',
-            libvirt.VIR_DOMAIN_CRASHED: 'crashed',
-            libvirt.VIR_DOMAIN_PMSUSPENDED: 'pmsuspended',
-        }
-        return states[state]
+        return _INSTANCE_STATES[state]
+
+    def _affect_flags(self, *, live: bool) -> int:
+        if live and self.is_running():
+            return (
+                libvirt.VIR_DOMAIN_AFFECT_LIVE
+                | libvirt.VIR_DOMAIN_AFFECT_CONFIG
+            )
+        return libvirt.VIR_DOMAIN_AFFECT_CONFIG
 
     def get_info(self) -> InstanceInfo:
         """Return instance info."""
@@ -311,22 +357,25 @@ class Instance:
 
     def get_max_vcpus(self) -> int:
         """Maximum vCPUs number for domain."""
-        if not self.is_running():
-            xml = etree.fromstring(self.dump_xml(inactive=True))
-            return int(xml.xpath('/domain/vcpu/text()')[0])
-        return self.domain.maxVcpus()
+        return self.domain.vcpusFlags(libvirt.VIR_DOMAIN_VCPU_MAXIMUM)
 
     def start(self) -> None:
         """Start defined instance."""
         log.info("Starting instance '%s'", self.name)
-        if self.is_running():
-            log.warning(
-                "Instance '%s' is already started, nothing to do", self.name
-            )
-            return
         try:
             self.domain.create()
         except libvirt.libvirtError as e:
+            # The same error code is returned for other start failures
+            # e.g. inactive network, so check that instance is running.
+            if (
+                e.get_error_code() == libvirt.VIR_ERR_OPERATION_INVALID
+                and self.is_running()
+            ):
+                log.warning(
+                    "Instance '%s' is already started, nothing to do",
+                    self.name,
+                )
+                return
             raise InstanceError(
                 f"Cannot start instance '{self.name}': {e}"
             ) from e
@@ -360,12 +409,6 @@ class Instance:
         """
         if not self.is_running():
             return
-        methods = {
-            'SOFT': libvirt.VIR_DOMAIN_SHUTDOWN_GUEST_AGENT,
-            'NORMAL': libvirt.VIR_DOMAIN_SHUTDOWN_DEFAULT,
-            'HARD': libvirt.VIR_DOMAIN_DESTROY_GRACEFUL,
-            'DESTROY': libvirt.VIR_DOMAIN_DESTROY_DEFAULT,
-        }
         if method is None:
             method = 'NORMAL'
         if not isinstance(method, str):
@@ -373,16 +416,16 @@ class Instance:
                 f"Shutdown method must be a 'str', not {type(method)}"
             )
         method = method.upper()
-        if method not in methods:
+        if method not in _SHUTDOWN_METHODS:
             raise ValueError(f"Unsupported shutdown method: '{method}'")
         if method == 'SOFT' and self.guest_agent.is_available() is False:
             method = 'NORMAL'
         log.info("Performing instance shutdown with method '%s'", method)
         try:
-            if method in ['SOFT', 'NORMAL']:
-                self.domain.shutdownFlags(flags=methods[method])
-            elif method in ['HARD', 'DESTROY']:
-                self.domain.destroyFlags(flags=methods[method])
+            if method in _GUEST_SHUTDOWN_METHODS:
+                self.domain.shutdownFlags(flags=_SHUTDOWN_METHODS[method])
+            else:
+                self.domain.destroyFlags(flags=_SHUTDOWN_METHODS[method])
         except libvirt.libvirtError as e:
             raise InstanceError(
                 f"Cannot shutdown instance '{self.name}' with '{method=}': {e}"
@@ -432,8 +475,7 @@ class Instance:
         self.shutdown('NORMAL')
         time.sleep(3)
         # TODO @ge: do safe shutdown insted of this shit
-        if self.is_running():
-            self.shutdown('HARD')
+        self.shutdown('HARD')
         time.sleep(1)
         self.start()
 
@@ -468,7 +510,8 @@ class Instance:
             raise InstanceError('Cannot set zero vCPUs')
         if nvcpus > self.get_max_vcpus():
             raise InstanceError('vCPUs count is greather than max_vcpus')
-        if nvcpus == self.get_info().nproc:
+        _, _, _, current_vcpus, _ = self.domain.info()
+        if nvcpus == current_vcpus:
             log.warning(
                 "Instance '%s' already have %s vCPUs, nothing to do",
                 self.name,
@@ -521,22 +564,17 @@ class Instance:
         """
         if memory <= 0:
             raise InstanceError('Cannot set zero memory')
-        if (memory * 1024) > self.get_max_memory():
+        _, max_memory, current_memory, *_ = self.domain.info()
+        if (memory * 1024) > max_memory:
             raise InstanceError('Memory is greather than max_memory')
-        if (memory * 1024) == self.get_info().memory:
+        if (memory * 1024) == current_memory:
             log.warning(
                 "Instance '%s' already have %s memory, nothing to do",
                 self.name,
                 memory,
             )
             return
-        if live and self.is_running():
-            flags = (
-                libvirt.VIR_DOMAIN_AFFECT_LIVE
-                | libvirt.VIR_DOMAIN_AFFECT_CONFIG
-            )
-        else:
-            flags = libvirt.VIR_DOMAIN_AFFECT_CONFIG
+        flags = self._affect_flags(live=live)
         try:
             self.domain.setMemoryFlags(memory * 1024, flags=flags)
         except libvirt.libvirtError as e:
@@ -552,13 +590,6 @@ class Instance:
         :param device: Object with device description e.g. DiskConfig
         :param live: Affect a running instance
         """
-        if live and self.is_running():
-            flags = (
-                libvirt.VIR_DOMAIN_AFFECT_LIVE
-                | libvirt.VIR_DOMAIN_AFFECT_CONFIG
-            )
-        else:
-            flags = libvirt.VIR_DOMAIN_AFFECT_CONFIG
         if isinstance(device, DiskConfig):  # noqa: SIM102
             if self.get_disk(device.target):
                 log.warning(
@@ -566,6 +597,7 @@ class Instance:
                     device.target,
                 )
                 return
+        flags = self._affect_flags(live=live)
         self.domain.attachDeviceFlags(device.to_xml(), flags=flags)
 
     def detach_device(
@@ -577,13 +609,6 @@ class Instance:
         :param device: Object with device description e.g. DiskConfig
         :param live: Affect a running instance
         """
-        if live and self.is_running():
-            flags = (
-                libvirt.VIR_DOMAIN_AFFECT_LIVE
-                | libvirt.VIR_DOMAIN_AFFECT_CONFIG
-            )
-        else:
-            flags = libvirt.VIR_DOMAIN_AFFECT_CONFIG
         if isinstance(device, DiskConfig):  # noqa: SIM102
             if self.get_disk(device.target) is None:
                 log.warning(
@@ -591,6 +616,7 @@ class Instance:
                     device.target,
                 )
                 return
+        flags = self._affect_flags(live=live)
         self.domain.detachDeviceFlags(device.to_xml(), flags=flags)
 
     def get_disk(
@@ -606,11 +632,13 @@ class Instance:
         :param persistent: If True get only persistent volumes described
             in instance XML config.
         """
-        xml = etree.fromstring(self.dump_xml(inactive=persistent))
-        child = xml.xpath(f'/domain/devices/disk/target[@dev="{name}"]')
-        if len(child) == 0:
-            return None
-        return DiskConfig.from_xml(child[0].getparent())
+        xml = self.dump_xml(inactive=persistent).encode()
+        for _, disk in etree.iterparse(BytesIO(xml), tag='disk'):
+            target = disk.find('target')
+            if target is not None and target.get('dev') == name:
+                return DiskConfig.from_xml(disk)
+            disk.clear()
+        return None
 
     def list_disks(self, *, persistent: bool = False) -> list[DiskConfig]:
         """
@@ -620,7 +648,7 @@ class Instance:
             in instance XML config.
         """
         xml = etree.fromstring(self.dump_xml(inactive=persistent))
-        disks = xml.xpath('/domain/devices/disk')
+        disks = xml.findall('devices/disk')
         return [DiskConfig.from_xml(disk) for disk in disks]
 
     def detach_disk(self, name: str, *, live: bool = False) -> None:
@@ -642,7 +670,8 @@ class Instance:
                 name,
             )
             return
-        self.detach_device(disk, live=live)
+        flags = self._affect_flags(live=live)
+        self.domain.detachDeviceFlags(disk.to_xml(), flags=flags)
 
     def resize_disk(
         self, name: str, capacity: int, unit: units.DataUnit
@@ -772,7 +801,16 @@ class Instance:
         :param with_volumes: If True delete local volumes with instance.
         """
         log.info("Shutdown instance '%s'", self.name)
-        self.shutdown(method='HARD')
+        try:
+            self.domain.destroyFlags(flags=libvirt.VIR_DOMAIN_DESTROY_GRACEFUL)
+        except libvirt.libvirtError as e:
+            if (
+                e.get_error_code() != libvirt.VIR_ERR_OPERATION_INVALID
+                or self.is_running()
+            ):
+                raise InstanceError(
+                    f"Cannot shutdown instance '{self.name}': {e}"
+                ) from e
         disks = self.list_disks(persistent=True)
         log.debug('Disks list: %s', disks)
         for disk in disks:
@@ -797,4 +835,9 @@ class Instance:
                 log.info('Delete volume: %s', volume.path())
                 volume.delete()
         log.info('Undefine instance')
-        self.domain.undefine()
+        self.domain.undefineFlags(
+            libvirt.VIR_DOMAIN_UNDEFINE_MANAGED_SAVE
+            | libvirt.VIR_DOMAIN_UNDEFINE_SNAPSHOTS_METADATA
+            | libvirt.VIR_DOMAIN_UNDEFINE_CHECKPOINTS_METADATA
+            | libvirt.VIR_DOMAIN_UNDEFINE_NVRAM
+        )
@@ -15,7 +15,7 @@
 
 """Compute instance related objects schemas."""
 
-import re
+import string
 from collections import Counter
 from enum import StrEnum
 from pathlib import Path
@@ -26,6 +26,9 @@ from compute.abstract import EntityModel
 from compute.utils.units import DataUnit
 
 
+_NAME_CHARS = frozenset(string.ascii_lowercase + string.digits + '_-')
+
+
 class CPUEmulationMode(StrEnum):
     """CPU emulation mode enumerated."""
 
@@ -173,7 +176,7 @@ class InstanceSchema(EntityModel):
 
     @validator('name')
     def _check_name(cls, value: str) -> str:  # noqa: N805
-        if not re.match(r'^[a-z0-9_-]+$', value):
+        if not value or not _NAME_CHARS.issuperset(value):
             msg = (
                 'Name must contain only lowercase letters, numbers, '
                 'minus sign and underscore.'
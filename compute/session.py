@@ -31,7 +31,7 @@ from .exceptions import (
     SessionError,
     StoragePoolNotFoundError,
 )
-from .instance import Instance, InstanceConfig, InstanceSchema
+from .instance import Instance, InstanceConfig, InstanceInfo, InstanceSchema
 from .instance.cloud_init import CloudInit
 from .instance.devices import DiskConfig, DiskDriver
 from .storage import StoragePool, VolumeConfig
@@ -218,9 +218,10 @@ class Session(AbstractContextManager):
         data = InstanceSchema(**kwargs)
         config = InstanceConfig(data)
         log.info('Define instance XML')
-        log.debug(config.to_xml())
+        xml = config.to_xml()
+        log.debug(xml)
         try:
-            self.connection.defineXML(config.to_xml())
+            self.connection.defineXML(xml)
         except libvirt.libvirtError as e:
             raise SessionError(f'Error defining instance: {e}') from e
         log.info('Getting instance object...')
@@ -333,6 +334,27 @@ class Session(AbstractContextManager):
         """List all instances."""
         return [Instance(dom) for dom in self.connection.listAllDomains()]
 
+    def list_instances_info(self) -> dict[str, InstanceInfo]:
+        """
+        Return info for all instances fetched in a single libvirt call.
+
+        Reference:
+        https://libvirt.org/html/libvirt-libvirt-domain.html#virConnectGetAllDomainStats
+        """
+        stats = (
+            libvirt.VIR_DOMAIN_STATS_STATE
+            | libvirt.VIR_DOMAIN_STATS_BALLOON
+            | libvirt.VIR_DOMAIN_STATS_VCPU
+            | libvirt.VIR_DOMAIN_STATS_CPU_TOTAL
+        )
+        try:
+            return {
+                dom.name(): InstanceInfo.from_stats(dom_stats)
+                for dom, dom_stats in self.connection.getAllDomainStats(stats)
+            }
+        except libvirt.libvirtError as e:
+            raise SessionError(e) from e
+
     def get_storage_pool(self, name: str) -> StoragePool:
         """Get storage pool by name."""
         try:
@@ -18,6 +18,7 @@
 import datetime
 import logging
 import time
+from collections.abc import Iterator
 from datetime import datetime as dt
 from datetime import timedelta
 from pathlib import Path
@@ -33,6 +34,17 @@ from .volume import Volume, VolumeConfig
 
 log = logging.getLogger(__name__)
 
+_POOL_PATH_XPATH = etree.XPath('/pool/target/path/text()', smart_strings=False)
+_POOL_CAPACITY_XPATH = etree.XPath(
+    '/pool/capacity/text()', smart_strings=False
+)
+_POOL_ALLOCATION_XPATH = etree.XPath(
+    '/pool/allocation/text()', smart_strings=False
+)
+_POOL_AVAILABLE_XPATH = etree.XPath(
+    '/pool/available/text()', smart_strings=False
+)
+
 
 class StoragePoolUsageInfo(NamedTuple):
     """Storage pool usage info."""
@@ -45,6 +57,8 @@ class StoragePoolUsageInfo(NamedTuple):
 class StoragePool:
     """Storage pool manipulating class."""
 
+    __slots__ = ('name', 'path', 'pool')
+
     def __init__(self, pool: libvirt.virStoragePool):
         """Initislise StoragePool."""
         self.pool = pool
@@ -54,15 +68,15 @@ class StoragePool:
     def _get_path(self) -> Path:
         """Return storage pool path."""
         xml = etree.fromstring(self.pool.XMLDesc())
-        return Path(xml.xpath('/pool/target/path/text()')[0])
+        return Path(_POOL_PATH_XPATH(xml)[0])
 
     def get_usage_info(self) -> StoragePoolUsageInfo:
         """Return info about storage pool usage."""
         xml = etree.fromstring(self.pool.XMLDesc())
         return StoragePoolUsageInfo(
-            capacity=int(xml.xpath('/pool/capacity/text()')[0]),
-            allocation=int(xml.xpath('/pool/allocation/text()')[0]),
-            available=int(xml.xpath('/pool/available/text()')[0]),
+            capacity=int(_POOL_CAPACITY_XPATH(xml)[0]),
+            allocation=int(_POOL_ALLOCATION_XPATH(xml)[0]),
+            available=int(_POOL_AVAILABLE_XPATH(xml)[0]),
         )
 
     def dump_xml(self) -> str:
@@ -96,15 +110,25 @@ class StoragePool:
             else:
                 return
 
-    def create_volume(self, vol_conf: VolumeConfig) -> Volume:
-        """Create storage volume and return Volume instance."""
+    def create_volume(
+        self, vol_conf: VolumeConfig, *, prealloc_metadata: bool = False
+    ) -> Volume:
+        """
+        Create storage volume and return Volume instance.
+
+        :param vol_conf: Volume config
+        :param prealloc_metadata: If True preallocate volume metadata.
+            This makes volume creation time proportional to its capacity.
+        """
         log.info(
             'Create storage volume vol=%s in pool=%s', vol_conf.name, self.name
         )
-        vol = self.pool.createXML(
-            vol_conf.to_xml(),
-            flags=libvirt.VIR_STORAGE_VOL_CREATE_PREALLOC_METADATA,
+        flags = (
+            libvirt.VIR_STORAGE_VOL_CREATE_PREALLOC_METADATA
+            if prealloc_metadata
+            else 0
         )
+        vol = self.pool.createXML(vol_conf.to_xml(), flags=flags)
         return Volume(self.pool, vol)
 
     def clone_volume(self, src: Volume, dst: VolumeConfig) -> Volume:
@@ -119,7 +143,7 @@ class StoragePool:
             'src_pool=%s src_vol=%s dst_pool=%s dst_vol=%s',
             src.pool_name,
             src.name,
-            self.pool.name(),
+            self.name,
             dst.name,
         )
         vol = self.pool.createXMLFrom(
@@ -131,22 +155,28 @@ class StoragePool:
             raise StoragePoolError
         return Volume(self.pool, vol)
 
-    def get_volume(self, name: str) -> Volume | None:
-        """Lookup and return Volume instance or None."""
+    def get_volume(self, name: str) -> Volume:
+        """
+        Lookup and return Volume instance.
+
+        :raise: :class:`VolumeNotFoundError`
+        """
         log.info(
-            'Lookup for storage volume vol=%s in pool=%s',
-            name,
-            self.pool.name(),
+            'Lookup for storage volume vol=%s in pool=%s', name, self.name
         )
         try:
             vol = self.pool.storageVolLookupByName(name)
-            return Volume(self.pool, vol)
         except libvirt.libvirtError as e:
             if e.get_error_code() == libvirt.VIR_ERR_NO_STORAGE_VOL:
                 raise VolumeNotFoundError(name) from e
             log.exception('unexpected error from libvirt')
             raise StoragePoolError(e) from e
+        return Volume(self.pool, vol)
+
+    def list_volumes(self) -> Iterator[Volume]:
+        """Return iterator over volumes in storage pool."""
+        return (Volume(self.pool, vol) for vol in self.pool.listAllVolumes())
 
-    def list_volumes(self) -> list[Volume]:
-        """Return list of volumes in storage pool."""
-        return [Volume(self.pool, vol) for vol in self.pool.listAllVolumes()]
+    def list_volume_names(self) -> list[str]:
+        """Return list of volume names in storage pool."""
+        return self.pool.listVolumes()
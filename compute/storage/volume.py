@@ -17,7 +17,6 @@
 
 from dataclasses import dataclass
 from pathlib import Path
-from time import time
 
 import libvirt
 from lxml import etree
@@ -27,7 +26,7 @@ from compute.abstract import EntityConfig
 from compute.utils import units
 
 
-@dataclass
+@dataclass(slots=True)
 class VolumeConfig(EntityConfig):
     """
     Storage volume XML config builder.
@@ -42,30 +41,28 @@ class VolumeConfig(EntityConfig):
 
     def to_xml(self) -> str:
         """Return XML config for libvirt."""
-        unixtime = str(int(time()))
-        xml = E.volume(type='file')
-        xml.append(E.name(self.name))
-        xml.append(E.key(self.path))
-        xml.append(E.source())
-        xml.append(E.capacity(str(self.capacity), unit='bytes'))
-        xml.append(E.allocation('0'))
-        xml.append(
+        xml = E.volume(
+            E.name(self.name),
+            E.key(self.path),
+            E.source(),
+            E.capacity(str(self.capacity), unit='bytes'),
+            E.allocation('0'),
             E.target(
                 E.path(self.path),
                 E.format(type='qcow2'),
-                E.timestamps(
-                    E.atime(unixtime), E.mtime(unixtime), E.ctime(unixtime)
-                ),
                 E.compat('1.1'),
                 E.features(E.lazy_refcounts()),
-            )
+            ),
+            type='file',
         )
-        return etree.tostring(xml, encoding='unicode', pretty_print=True)
+        return etree.tostring(xml, encoding='unicode')
 
 
 class Volume:
     """Storage volume manipulating class."""
 
+    __slots__ = ('_name', '_path', '_pool_name', 'pool', 'vol')
+
     def __init__(
         self, pool: libvirt.virStoragePool, vol: libvirt.virStorageVol
     ):
@@ -76,10 +73,31 @@ class Volume:
         :param vol: libvirt virStorageVol object
         """
         self.pool = pool
-        self.pool_name = pool.name()
         self.vol = vol
-        self.name = vol.name()
-        self.path = Path(vol.path())
+        self._pool_name = None
+        self._name = None
+        self._path = None
+
+    @property
+    def pool_name(self) -> str:
+        """Storage pool name."""
+        if self._pool_name is None:
+            self._pool_name = self.pool.name()
+        return self._pool_name
+
+    @property
+    def name(self) -> str:
+        """Volume name."""
+        if self._name is None:
+            self._name = self.vol.name()
+        return self._name
+
+    @property
+    def path(self) -> Path:
+        """Volume path."""
+        if self._path is None:
+            self._path = Path(self.vol.path())
+        return self._path
 
     def dump_xml(self) -> str:
         """Return volume XML description as string."""
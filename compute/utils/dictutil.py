@@ -26,14 +26,14 @@ def merge(a: dict, b: dict, path: list[str] | None = None) -> dict:
     """
     if path is None:
         path = []
-    for key in b:
+    for key, value in b.items():
         if key in a:
-            if isinstance(a[key], dict) and isinstance(b[key], dict):
-                merge(a[key], b[key], [*path, str(key)])
-            elif a[key] != b[key]:
+            if isinstance(a[key], dict) and isinstance(value, dict):
+                merge(a[key], value, [*path, str(key)])
+            elif a[key] != value:
                 raise DictMergeConflictError('.'.join([*path, str(key)]))
         else:
-            a[key] = b[key]
+            a[key] = value
     return a
 
 
@@ -66,12 +66,12 @@ def override(a: dict, b: dict) -> dict:
     :param b: A dict whose values will be used to rewrite dict `a`.
     :return: Modified `a` dict.
     """
-    for key in b:
+    for key, value in b.items():
         if key in a:
-            if isinstance(a[key], dict) and isinstance(b[key], dict):
-                override(a[key], b[key])
+            if isinstance(a[key], dict) and isinstance(value, dict):
+                override(a[key], value)
             else:
-                a[key] = b[key]  # replace existing key's values
+                a[key] = value  # replace existing key's values
         else:
-            a[key] = b[key]
+            a[key] = value
     return a
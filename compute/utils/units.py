@@ -46,6 +46,23 @@ class DataUnit(StrEnum):
         return None
 
 
+_BYTES_MULTIPLIERS = {
+    DataUnit.BYTES: 1,
+    DataUnit.KIB: 2**10,
+    DataUnit.MIB: 2**20,
+    DataUnit.GIB: 2**30,
+    DataUnit.TIB: 2**40,
+    DataUnit.KB: 10**3,
+    DataUnit.MB: 10**6,
+    DataUnit.GB: 10**9,
+    DataUnit.TB: 10**12,
+    DataUnit.KBIT: 125,
+    DataUnit.MBIT: 125 * 10**3,
+    DataUnit.GBIT: 125 * 10**6,
+    DataUnit.TBIT: 125 * 10**9,
+}
+
+
 def validate_input(*args: str) -> Callable:
     """Validate data units in functions input."""
     to_validate = args
@@ -73,25 +90,7 @@ def validate_input(*args: str) -> Callable:
 @validate_input('unit')
 def to_bytes(value: float, unit: DataUnit = DataUnit.BYTES) -> float:
     """Convert value to bytes."""
-    unit = DataUnit(unit)
-    basis = 2 if unit.endswith('iB') else 10
-    factor = 125 if unit.endswith('bit') else 1
-    power = {
-        DataUnit.BYTES: 0,
-        DataUnit.KIB: 10,
-        DataUnit.MIB: 20,
-        DataUnit.GIB: 30,
-        DataUnit.TIB: 40,
-        DataUnit.KB: 3,
-        DataUnit.MB: 6,
-        DataUnit.GB: 9,
-        DataUnit.TB: 12,
-        DataUnit.KBIT: 0,
-        DataUnit.MBIT: 3,
-        DataUnit.GBIT: 6,
-        DataUnit.TBIT: 9,
-    }
-    return value * factor * pow(basis, power[unit])
+    return value * _BYTES_MULTIPLIERS[DataUnit(unit)]
 
 
 @validate_input('from_unit', 'to_unit')